@@ -1,8 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.integrate import quad
 from abc import ABC, abstractmethod
-from typing import Tuple, Optional, List
+from functools import cached_property
+from typing import Dict, Tuple, Optional, List
 
 # --- Configuración Global y Constantes ---
 # Usamos dataclass o constantes simples para configuración
@@ -10,6 +10,50 @@ H_PARAM = 0.674  # Parámetro de Hubble reducido h
 H0 = 100 * H_PARAM 
 T_HUBBLE_INV = 1.0  # Trabajaremos en unidades de tiempo de Hubble (1/H0)
 
+# Estilo de las gráficas: se aplica una sola vez al importar el módulo
+plt.style.use('seaborn-v0_8-whitegrid')
+
+# --- Soluciones analíticas t(a) ---
+# Funciones puras y vectorizadas a nivel de módulo: las clases delegan en ellas
+# y pueden reutilizarse directamente en barridos de parámetros (sin instanciar modelos).
+def _matter_time(a: np.ndarray) -> np.ndarray:
+    """Einstein-de Sitter: t = (2/3) a^(3/2)."""
+    # a^(3/2) = a*sqrt(a), calculado sobre un único array de salida (sin temporales)
+    t_values = np.sqrt(a)
+    t_values *= a
+    t_values *= 2/3
+    return t_values
+
+def _empty_time(a: np.ndarray) -> np.ndarray:
+    """Milne: t = a (se devuelve la entrada sin copiarla)."""
+    return a
+
+def _lcdm_time(a: np.ndarray, omega_m, omega_l) -> np.ndarray:
+    """
+    Materia + Lambda (plano): integral de da / sqrt(Omega_M/a + Omega_L a^2) en forma cerrada.
+      Omega_L > 0: t = 2/(3 sqrt(Omega_L)) * arcsinh( sqrt(Omega_L/Omega_M) * a^(3/2) )
+      Omega_L = 0: t = 2/(3 sqrt(Omega_M)) * a^(3/2)   (límite Einstein-de Sitter)
+      Omega_L < 0: t = 2/(3 sqrt(|Omega_L|)) * arcsin( sqrt(|Omega_L|/Omega_M) * a^(3/2) )
+    En el último caso el resultado es NaN más allá del máximo de expansión, igual que la
+    integral numérica. Omega_M y Omega_L pueden ser escalares o arrays compatibles por
+    broadcasting con `a`. El resultado conserva la precisión de `a` (float32 si la malla es float32).
+    """
+    a = np.asarray(a)
+    dtype = np.result_type(a.dtype, np.float32)
+    omega_m = np.asarray(omega_m, dtype=dtype)
+    omega_l = np.asarray(omega_l, dtype=dtype)
+    # a^(3/2) como a*sqrt(a): sqrt es mucho más barato que la potencia genérica
+    a32 = a * np.sqrt(a)
+    abs_l = np.abs(omega_l)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = np.sqrt(abs_l / omega_m) * a32
+        prefactor = 2.0 / (3.0 * np.sqrt(abs_l))
+        if np.all(omega_l > 0):
+            # Caso habitual: solo hace falta la rama arcsinh
+            return prefactor * np.arcsinh(x)
+        t_values = np.where(omega_l > 0, prefactor * np.arcsinh(x), prefactor * np.arcsin(x))
+        return np.where(omega_l == 0, (2.0 / (3.0 * np.sqrt(omega_m))) * a32, t_values)
+
 class CosmologicalModel(ABC):
     """
     Clase abstracta que define la interfaz para cualquier modelo de universo FLRW.
@@ -36,7 +80,7 @@ class MatterDominatedUniverse(CosmologicalModel):
     def calculate_time(self, a_array: np.ndarray) -> np.ndarray:
         # Solución analítica: t ~ a^(3/2)
         # Inversa de a ~ t^(2/3)
-        return (2/3) * (a_array**(3/2))
+        return _matter_time(a_array)
 
     @property
     def age_of_universe(self) -> float:
@@ -47,7 +91,7 @@ class EmptyUniverse(CosmologicalModel):
     
     def calculate_time(self, a_array: np.ndarray) -> np.ndarray:
         # Solución analítica lineal: a ~ t
-        return a_array 
+        return _empty_time(a_array)
 
     @property
     def age_of_universe(self) -> float:
@@ -57,67 +101,115 @@ class LambdaCDMUniverse(CosmologicalModel):
     """Modelo de Concordancia (Materia + Energía Oscura)."""
     
     def __init__(self, omega_m: float = 0.3, omega_l: float = 0.7):
+        if omega_m <= 0:
+            raise ValueError("La solución analítica requiere Omega_M > 0 (con Omega_M = 0 la integral diverge).")
         super().__init__(name=f'Lambda-CDM ($\Omega_M={omega_m}, \Omega_\Lambda={omega_l}$)', color='blue')
         self.omega_m = omega_m
         self.omega_l = omega_l
 
-    def _friedmann_integrand(self, x: float) -> float:
-        """Integrando de la ecuación de Friedmann."""
-        if x == 0: return 0
-        return 1.0 / np.sqrt(self.omega_m / x + self.omega_l * x**2)
-
     def calculate_time(self, a_array: np.ndarray) -> np.ndarray:
-        t_values = np.zeros_like(a_array)
-        for i, a in enumerate(a_array):
-            # Integramos numéricamente para cada punto del factor de escala
-            res, _ = quad(self._friedmann_integrand, 0, a)
-            t_values[i] = res
-        return t_values
+        # Solución analítica de la integral de Friedmann (Materia + Lambda)
+        return _lcdm_time(a_array, self.omega_m, self.omega_l)
 
-    @property
+    @cached_property
     def age_of_universe(self) -> float:
-        # Calculamos el tiempo para a=1.0
-        res, _ = quad(self._friedmann_integrand, 0, 1.0)
-        return res
+        # Misma expresión evaluada en a=1.0 (se calcula una sola vez por instancia)
+        return float(_lcdm_time(1.0, self.omega_m, self.omega_l))
 
-def plot_universe_expansion(models: List[CosmologicalModel], save_path: Optional[str] = None):
+def lambda_cdm_time_matrix(a_array: np.ndarray, params: List[Tuple[float, float]]) -> np.ndarray:
     """
-    Genera la comparativa visual de la expansión.
+    Evalúa la solución analítica de varios modelos Lambda-CDM a la vez.
+    Devuelve una matriz (n_modelos, n_puntos): a^(3/2) se calcula una sola vez
+    y los parámetros (Omega_M, Omega_L) de cada modelo se difunden (broadcasting) por filas.
     """
-    a_range = np.linspace(0.01, 2.5, 300) # Factor de escala de 0 a 2.5
-    
-    plt.figure(figsize=(10, 7), dpi=100)
-    plt.style.use('seaborn-v0_8-whitegrid')
+    omegas = np.asarray(params, dtype=float).reshape(-1, 2)
+    return _lcdm_time(a_array[None, :], omegas[:, 0:1], omegas[:, 1:2])
+
+def compute_curves(models: List[CosmologicalModel],
+                   a_range: np.ndarray) -> Dict[CosmologicalModel, Tuple[np.ndarray, float]]:
+    """
+    Calcula, sin graficar nada, la curva t(a) y la edad actual de cada modelo.
+    Devuelve un diccionario {modelo: (t_vals, t_edad)}. La clave es el propio objeto
+    y no su nombre: dos modelos con el mismo nombre pero distinta física no comparten curva.
+    """
+    # Los modelos Lambda-CDM se evalúan juntos en una sola operación vectorizada
+    lcdm_models = [m for m in models if isinstance(m, LambdaCDMUniverse)]
+    lcdm_times = {}
+    if lcdm_models:
+        t_matrix = lambda_cdm_time_matrix(a_range, [(m.omega_m, m.omega_l) for m in lcdm_models])
+        lcdm_times = dict(zip(lcdm_models, t_matrix))
+
+    curves = {}
+    for model in models:
+        t_vals = lcdm_times.get(model)
+        if t_vals is None:
+            t_vals = model.calculate_time(a_range)
+        curves[model] = (t_vals, model.age_of_universe)
+    return curves
+
+def render(models: List[CosmologicalModel], curves: Dict[CosmologicalModel, Tuple[np.ndarray, float]],
+           a_range: np.ndarray, ax: Optional[plt.Axes] = None) -> plt.Axes:
+    """
+    Dibuja las curvas ya calculadas por `compute_curves`.
+    Si se pasa un `ax` existente se limpia y se reutiliza (útil en barridos de
+    parámetros), evitando crear una figura nueva en cada llamada.
+    """
+    if ax is None:
+        # constrained_layout ajusta los márgenes al dibujar; no hace falta tight_layout
+        fig, ax = plt.subplots(figsize=(10, 7), dpi=100, constrained_layout=True)
+    else:
+        ax.clear()
 
     # Graficamos cada modelo
     for model in models:
-        t_vals = model.calculate_time(a_range)
-        t_age = model.age_of_universe
+        t_vals, t_age = curves[model]
         
-        plt.plot(t_vals, a_range, label=model.name, color=model.color, linewidth=2.5)
+        ax.plot(t_vals, a_range, label=model.name, color=model.color, linewidth=2.5)
         
         # Marcador de la edad actual
-        plt.plot(t_age, 1.0, 'o', color=model.color, markersize=8, markeredgecolor='white')
+        ax.plot(t_age, 1.0, 'o', color=model.color, markersize=8, markeredgecolor='white')
         
         # Anotación opcional para el LambdaCDM (el más relevante)
         if isinstance(model, LambdaCDMUniverse):
-            plt.axvline(t_age, color=model.color, linestyle=':', alpha=0.6)
-            plt.text(t_age + 0.05, 0.1, f'Edad Hoy: {t_age:.2f} $1/H_0$', color=model.color, fontweight='bold')
+            ax.axvline(t_age, color=model.color, linestyle=':', alpha=0.6)
+            ax.text(t_age + 0.05, 0.1, f'Edad Hoy: {t_age:.2f} $1/H_0$', color=model.color, fontweight='bold')
 
     # Línea de referencia "Hoy" (a=1)
-    plt.axhline(1.0, color='gray', linestyle='--', alpha=0.5, label='Actualidad ($a=1$)')
-
-    plt.title(r'Historia de la Expansión Cósmica: Modelos FLRW', fontsize=16)
-    plt.xlabel(r'Tiempo Cósmico [$H_0^{-1}$]', fontsize=12)
-    plt.ylabel(r'Factor de Escala $a(t)$', fontsize=12)
-    plt.xlim(0, 2.0)
-    plt.ylim(0, 2.5)
-    plt.legend(fontsize=10, loc='upper left')
-    plt.tight_layout()
-    
-    if save_path:
-        plt.savefig(save_path)
-    plt.show()
+    ax.axhline(1.0, color='gray', linestyle='--', alpha=0.5, label='Actualidad ($a=1$)')
+
+    ax.set_title(r'Historia de la Expansión Cósmica: Modelos FLRW', fontsize=16)
+    ax.set_xlabel(r'Tiempo Cósmico [$H_0^{-1}$]', fontsize=12)
+    ax.set_ylabel(r'Factor de Escala $a(t)$', fontsize=12)
+    ax.set_xlim(0, 2.0)
+    ax.set_ylim(0, 2.5)
+    ax.legend(fontsize=10, loc='upper left')
+    return ax
+
+def plot_universe_expansion(models: List[CosmologicalModel], save_path: Optional[str] = None,
+                            ax: Optional[plt.Axes] = None,
+                            show: bool = True) -> Dict[CosmologicalModel, Tuple[np.ndarray, float]]:
+    """
+    Genera la comparativa visual de la expansión.
+    Solo se dibuja si se va a guardar (`save_path`) o mostrar (`show=True`); con
+    `show=False` y sin `save_path` únicamente se calculan y devuelven las curvas.
+    """
+    # Factor de escala de 0 a 2.5. float32 es de sobra para una curva que se rasteriza
+    # a unos cientos de píxeles, y reduce a la mitad la memoria de todo el cálculo.
+    # Malla logarítmica: más puntos a a pequeño (donde las curvas se doblan más) y
+    # menos en la zona tardía, casi lineal.
+    a_range = np.geomspace(0.01, 2.5, 128, dtype=np.float32)
+    curves = compute_curves(models, a_range)
+
+    if save_path or show:
+        owns_figure = ax is None
+        ax = render(models, curves, a_range, ax)
+        if save_path:
+            ax.figure.savefig(save_path)
+        if show:
+            plt.show()
+        elif owns_figure:
+            plt.close(ax.figure)
+    return curves
 
 # --- Bloque Principal ---
 if __name__ == "__main__":
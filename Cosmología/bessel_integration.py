@@ -1,17 +1,29 @@
 import numpy as np
-from scipy.integrate import quad
+from scipy.integrate import quad, cumulative_trapezoid
 from scipy.special import kv
-import math
 import matplotlib.pyplot as plt
 
+# Serie asintótica de K1(y)/K2(y) en potencias de 1/y (cociente de las expansiones
+# de Hankel de K_1 y K_2). Con estos 8 términos el error relativo es < 1e-8 para y >= 20.
+Y_ASINT = 20.0
+COEF_ASINT = (1.0, -3/2, 15/8, -15/8, 135/128, 45/32, -7425/1024, 675/32)
+
 def frac_K1_K2(y): #fraccion de funciones de bessel
 
-    return kv(1,y)/kv(2,y)
+    y = np.asarray(y, dtype=float)
+    y1 = np.atleast_1d(y)
+    r = np.empty_like(y1)
+    # kv solo donde hace falta; en la cola usamos la serie (unas pocas multiplicaciones)
+    small = y1 < Y_ASINT
+    r[small] = kv(1,y1[small])/kv(2,y1[small])
+    r[~small] = np.polynomial.polynomial.polyval(1.0/y1[~small], COEF_ASINT)
+    return r.reshape(y.shape)
 
-def integrando(y): #definimos el integrando
+def integrando(y): #definimos el integrando (acepta escalares o arrays)
 
+    y = np.asarray(y)
     r = frac_K1_K2(y)
-    return (y**2.5) * math.exp(-y) * r
+    return (y**2.5) * np.exp(-y) * r
 
 def I_x(x): #calculamos la integral empleando quad
     if x <= 0:
@@ -21,18 +33,21 @@ def I_x(x): #calculamos la integral empleando quad
 
 # compute values
 xs = np.linspace(0, 50, 1000)
-vals = [I_x(float(x)) for x in xs]
-for x in xs:
-    print(f"I({x}) = {I_x(x)}")
-    
-x10 = xs[xs>10] #vemos que para x>10 se empieza a estabilizar
-lx10 = len(x10) #longitud array
-suma = 0
-
-for x in x10:
-    intg = I_x(x)
-    suma = suma + intg
-media = suma/lx10
+
+# I(x) es acumulativa en x: en lugar de integrar desde 0 para cada punto,
+# evaluamos el integrando una sola vez en una malla más fina y acumulamos con
+# la regla del trapecio. Luego nos quedamos con los valores en los puntos de xs.
+REFINE = 10
+ys_fine = np.linspace(0, 50, REFINE*(len(xs) - 1) + 1)
+f_fine = np.zeros_like(ys_fine)
+# En y=0 kv diverge, pero el integrando tiende a 0 (K1/K2 ~ y/2): lo dejamos a 0
+f_fine[1:] = integrando(ys_fine[1:])
+vals = cumulative_trapezoid(f_fine, ys_fine, initial=0.0)[::REFINE]
+
+# Reutilizamos los valores ya calculados y los escribimos de una sola vez
+print("\n".join(f"I({x}) = {v}" for x, v in zip(xs, vals)))
+
+media = vals[xs>10].mean() #vemos que para x>10 se empieza a estabilizar
 print("Valor medio I(x>>1) = ", media)
 
 # plot
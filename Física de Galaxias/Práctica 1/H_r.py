@@ -1,6 +1,6 @@
 import numpy as np
 import pandas as pd
-from scipy.optimize import curve_fit
+from plot_utils import show_or_save  # Fija backend (HEADLESS) y estilo
 import matplotlib.pyplot as plt
 from io import StringIO
 from typing import Dict, List, Optional, Tuple
@@ -9,6 +9,61 @@ from typing import Dict, List, Optional, Tuple
 # Factor de conversión de magnitudes a flujo lineal: 2.5 * log10(e)
 POGSON_SCALE_FACTOR = 2.5 * np.log10(np.e) 
 
+def _fit_one_band(band: str, r: np.ndarray, mu: np.ndarray,
+                  scale_kpc: float) -> Optional[Tuple[Dict, Dict]]:
+    """
+    Ajusta el disco exponencial de una sola banda.
+    Es independiente del resto de bandas (y de galaxias), así que puede repartirse
+    en paralelo cuando se procesan muchos perfiles.
+
+    Returns:
+        (resumen, internos): la fila del resumen de resultados y los datos para
+        graficar, o None si no hay suficientes puntos válidos.
+    """
+    # 1. Limpieza de datos (Drop NaNs) con una máscara booleana
+    valid = ~np.isnan(r) & ~np.isnan(mu)
+    r_vals = r[valid]
+    mu_vals = mu[valid]
+
+    if len(r_vals) < 3:
+        return None
+
+    # 2. Ajuste lineal por mínimos cuadrados (solución cerrada, sin iterar)
+    # Slope (m) = 1.0857 / H_r  -> H_r = 1.0857 / m
+    A = np.column_stack([np.ones_like(r_vals), r_vals])
+    popt = np.linalg.lstsq(A, mu_vals, rcond=None)[0]
+    # Covarianza igual que curve_fit: s^2 (A^T A)^-1, con s^2 = SSR / (N - 2)
+    s2 = np.sum((mu_vals - A @ popt)**2) / (len(r_vals) - 2)
+    pcov = s2 * np.linalg.inv(A.T @ A)
+
+    mu0, slope = popt
+    perr = np.sqrt(np.diag(pcov))
+    err_mu0, err_slope = perr
+
+    # 3. Cálculo de H_r y Propagación de Errores
+    # H_r = C / slope
+    # Error(H_r) = | -C / slope^2 | * error_slope
+    h_r_arcsec = POGSON_SCALE_FACTOR / slope
+    h_r_error_arcsec = (POGSON_SCALE_FACTOR / (slope**2)) * err_slope
+
+    # 4. Conversión a Kpc
+    h_r_kpc = h_r_arcsec * scale_kpc
+    h_r_error_kpc = h_r_error_arcsec * scale_kpc
+
+    # Resultados estructurados
+    summary = {
+        'Band': band,
+        'H_r (arcsec)': h_r_arcsec,
+        'err_H_r (arcsec)': h_r_error_arcsec,
+        'H_r (kpc)': h_r_kpc,
+        'err_H_r (kpc)': h_r_error_kpc,
+        'mu_0': mu0,
+        'err_mu_0': err_mu0,
+        'slope': slope
+    }
+    internals = {'popt': popt, 'r_vals': r_vals, 'mu_vals': mu_vals}
+    return summary, internals
+
 class GalaxyMorphologyFitter:
     """
     Herramienta para ajustar perfiles de brillo superficial de galaxias 
@@ -24,11 +79,10 @@ class GalaxyMorphologyFitter:
         self.df = data
         self.scale_kpc = pixel_scale_kpc
         self.results = {}
-
-    @staticmethod
-    def _linear_model(r: float, mu0: float, slope: float) -> float:
-        """Modelo lineal: mu(r) = mu0 + slope * r"""
-        return mu0 + slope * r
+        # Columnas como arrays de NumPy (se extraen una sola vez)
+        self._r = data['r_arcsec'].to_numpy(dtype=float)
+        self._mu = {col[3:]: data[col].to_numpy(dtype=float)
+                    for col in data.columns if col.startswith('mu_')}
 
     def fit_exponential_disk(self, bands: List[str] = ['r', 'g', 'i']) -> pd.DataFrame:
         """
@@ -37,51 +91,18 @@ class GalaxyMorphologyFitter:
         fit_summary = []
 
         for band in bands:
-            col_name = f'mu_{band}'
-            if col_name not in self.df.columns:
+            if band not in self._mu:
                 print(f"Advertencia: Banda {band} no encontrada en los datos.")
                 continue
 
-            # 1. Limpieza de datos (Drop NaNs)
-            valid_data = self.df[['r_arcsec', col_name]].dropna()
-            r_vals = valid_data['r_arcsec'].values
-            mu_vals = valid_data[col_name].values
-
-            if len(r_vals) < 3:
+            fit = _fit_one_band(band, self._r, self._mu[band], self.scale_kpc)
+            if fit is None:
                 continue # No hay suficientes puntos para ajustar
 
-            # 2. Ajuste (Curve Fit)
-            # Slope (m) = 1.0857 / H_r  -> H_r = 1.0857 / m
-            popt, pcov = curve_fit(self._linear_model, r_vals, mu_vals, p0=[20, 0.1])
-            
-            mu0, slope = popt
-            perr = np.sqrt(np.diag(pcov))
-            err_mu0, err_slope = perr
-
-            # 3. Cálculo de H_r y Propagación de Errores
-            # H_r = C / slope
-            # Error(H_r) = | -C / slope^2 | * error_slope
-            h_r_arcsec = POGSON_SCALE_FACTOR / slope
-            h_r_error_arcsec = (POGSON_SCALE_FACTOR / (slope**2)) * err_slope
-
-            # 4. Conversión a Kpc
-            h_r_kpc = h_r_arcsec * self.scale_kpc
-            h_r_error_kpc = h_r_error_arcsec * self.scale_kpc
-
-            # Guardamos resultados estructurados
-            fit_summary.append({
-                'Band': band,
-                'H_r (arcsec)': h_r_arcsec,
-                'err_H_r (arcsec)': h_r_error_arcsec,
-                'H_r (kpc)': h_r_kpc,
-                'err_H_r (kpc)': h_r_error_kpc,
-                'mu_0': mu0,
-                'err_mu_0': err_mu0,
-                'slope': slope
-            })
-            
+            summary, internals = fit
+            fit_summary.append(summary)
             # Guardamos parámetros internos para plotear después
-            self.results[band] = {'popt': popt, 'r_vals': r_vals, 'mu_vals': mu_vals}
+            self.results[band] = internals
 
         return pd.DataFrame(fit_summary)
 
@@ -91,8 +112,7 @@ class GalaxyMorphologyFitter:
             print("No hay ajustes para graficar. Ejecuta fit_exponential_disk primero.")
             return
 
-        plt.figure(figsize=(10, 6), dpi=100)
-        plt.style.use('seaborn-v0_8-whitegrid')
+        fig = plt.figure(figsize=(10, 6), dpi=100)
         
         colors = {'r': '#e74c3c', 'g': '#27ae60', 'i': '#2980b9'}
 
@@ -101,10 +121,10 @@ class GalaxyMorphologyFitter:
             plt.scatter(data['r_vals'], data['mu_vals'], label=f'Banda {band} (Obs)', 
                         color=colors.get(band, 'black'), s=15, alpha=0.7)
             
-            # Línea de ajuste
+            # Línea de ajuste: mu(r) = mu0 + slope * r
             mu0, slope = data['popt']
-            r_range = np.linspace(min(data['r_vals']), max(data['r_vals']), 100)
-            plt.plot(r_range, self._linear_model(r_range, mu0, slope), 
+            r_range = np.linspace(data['r_vals'].min(), data['r_vals'].max(), 100)
+            plt.plot(r_range, mu0 + slope * r_range, 
                      linestyle='--', color=colors.get(band, 'black'), linewidth=1.5)
 
         plt.gca().invert_yaxis() # Magnitudes: mayor valor es menos brillo
@@ -113,9 +133,7 @@ class GalaxyMorphologyFitter:
         plt.title('Ajuste de Disco Exponencial (Perfil Radial)')
         plt.legend()
         
-        if save_path:
-            plt.savefig(save_path)
-        plt.show()
+        show_or_save(fig, save_path, 'ajuste_disco_exponencial.png')
 
     @staticmethod
     def generate_latex_table(df_results: pd.DataFrame) -> str:
@@ -129,11 +147,14 @@ class GalaxyMorphologyFitter:
         \textbf{Banda} & \textbf{$H_r$ (arcsec)} & \textbf{$H_r$ (kpc)} & \textbf{$\mu_0$} \\
         \midrule
 """
-        body = ""
-        for _, row in df_results.iterrows():
-            body += f"        {row['Band']} & ${row['H_r (arcsec)']:.2f} \\pm {row['err_H_r (arcsec)']:.2f}$ & "
-            body += f"${row['H_r (kpc)']:.2f} \\pm {row['err_H_r (kpc)']:.2f}$ & "
-            body += f"${row['mu_0']:.2f} \\pm {row['err_mu_0']:.2f}$ \\\\\n"
+        # Una línea por banda; se unen al final en una sola operación
+        rows = [
+            f"        {row['Band']} & ${row['H_r (arcsec)']:.2f} \\pm {row['err_H_r (arcsec)']:.2f}$ & "
+            f"${row['H_r (kpc)']:.2f} \\pm {row['err_H_r (kpc)']:.2f}$ & "
+            f"${row['mu_0']:.2f} \\pm {row['err_mu_0']:.2f}$ \\\\\n"
+            for row in df_results.to_dict('records')
+        ]
+        body = "".join(rows)
 
         footer = r"""        \bottomrule
     \end{tabular}
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from plot_utils import show_or_save  # Fija backend (HEADLESS) y estilo
 import matplotlib.pyplot as plt
 from typing import List, Dict, Optional, Tuple
 from io import StringIO
@@ -20,9 +21,14 @@ class GalaxyProfilePlotter:
         self.sma_col = sma_col
         self.fit_results = {} # Almacenará los coeficientes del ajuste
 
+        # Bandas y columnas se detectan y extraen a NumPy una sola vez
+        self._bands = [col[3:] for col in self.df.columns if col.startswith('mu_')]
+        self._x = self.df[sma_col].to_numpy()
+        self._mu_arrays = {band: self.df[f'mu_{band}'].to_numpy() for band in self._bands}
+
     def get_available_bands(self) -> List[str]:
         """Detecta automáticamente las columnas de magnitud (empiezan por 'mu_')."""
-        return [col.replace('mu_', '') for col in self.df.columns if col.startswith('mu_')]
+        return list(self._bands)
 
     def fit_profiles(self, 
                      lower_frac: float = 0.03, 
@@ -34,8 +40,7 @@ class GalaxyProfilePlotter:
             lower_frac (float): Límite inferior (fracción del radio total).
             upper_frac (float): Límite superior (fracción del radio total).
         """
-        bands = self.get_available_bands()
-        x = self.df[self.sma_col].values
+        x = self._x
         
         # Definir rango dinámico en base a los datos
         x_min, x_max = x.min(), x.max()
@@ -50,13 +55,16 @@ class GalaxyProfilePlotter:
 
         print(f"--- Ajustando perfiles entre {x_low_limit:.2f} y {x_high_limit:.2f} arcsec ---")
 
-        for band in bands:
-            col_name = f'mu_{band}'
-            y = self.df[col_name].values
+        # Matriz de diseño [x, 1] del ajuste lineal: es la misma para todas las bandas
+        x_fit = x[mask]
+        A = np.column_stack([x_fit, np.ones_like(x_fit)])
+
+        for band in self._bands:
+            y = self._mu_arrays[band]
             
-            # Ajuste polinómico de grado 1 (Lineal)
+            # Ajuste lineal por mínimos cuadrados
             # coef[0] = pendiente, coef[1] = ordenada
-            coef = np.polyfit(x[mask], y[mask], 1)
+            coef = np.linalg.lstsq(A, y[mask], rcond=None)[0]
             self.fit_results[band] = coef
             
             print(f"Banda {band}: Pendiente={coef[0]:.4f}, Intercepto={coef[1]:.2f}")
@@ -71,8 +79,7 @@ class GalaxyProfilePlotter:
         if not self.fit_results:
             print("Advertencia: Ejecuta 'fit_profiles' antes de graficar para ver las líneas de tendencia.")
 
-        plt.figure(figsize=(10, 7), dpi=120)
-        plt.style.use('seaborn-v0_8-whitegrid') # Estilo profesional
+        fig = plt.figure(figsize=(10, 7), dpi=120)
         
         # Configuración estética por banda (extensible)
         styles = {
@@ -81,12 +88,16 @@ class GalaxyProfilePlotter:
             'i': {'color': '#2980b9', 'marker': '^', 'label': 'Banda i'}
         }
         
-        x = self.df[self.sma_col]
+        x = self._x
+
+        # Malla de la línea de ajuste: el rango es común a todas las bandas
+        if self.fit_results:
+            x_fit = np.linspace(*self.fit_bounds, 100)
 
         # 1. Graficar Datos Crudos
-        for band in self.get_available_bands():
+        for band in self._bands:
             style = styles.get(band, {'color': 'gray', 'marker': 'x', 'label': band})
-            y = self.df[f'mu_{band}']
+            y = self._mu_arrays[band]
             
             plt.scatter(x, y, label=style['label'], color=style['color'], 
                         marker=style['marker'], s=40, alpha=0.8, edgecolors='white')
@@ -95,9 +106,7 @@ class GalaxyProfilePlotter:
             if band in self.fit_results:
                 slope, intercept = self.fit_results[band]
                 
-                # Crear línea solo en el rango de ajuste
-                low, high = self.fit_bounds
-                x_fit = np.linspace(low, high, 100)
+                # Línea solo en el rango de ajuste
                 y_fit = slope * x_fit + intercept
                 
                 plt.plot(x_fit, y_fit, color=style['color'], linestyle='-', linewidth=2, alpha=0.9)
@@ -116,10 +125,7 @@ class GalaxyProfilePlotter:
         plt.grid(True, linestyle=':', alpha=0.6)
         
         plt.tight_layout()
-        if save_path:
-            plt.savefig(save_path)
-            print(f"Gráfica guardada en: {save_path}")
-        plt.show()
+        show_or_save(fig, save_path, 'perfil_brillo.png')
 
 # --- Mock Data para probar el código (Copiar y Pegar) ---
 RAW_CSV = """SMA,mu_r,mu_g,mu_i
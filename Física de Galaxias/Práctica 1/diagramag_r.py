@@ -1,5 +1,7 @@
 import pandas as pd
+from plot_utils import show_or_save  # Fija backend (HEADLESS) y estilo
 import matplotlib.pyplot as plt
+from scipy.ndimage import uniform_filter1d
 import io
 from typing import Optional
 
@@ -33,12 +35,14 @@ class GalaxyPhotometryAnalyzer:
         Calcula el índice de color (g - r).
         El color es un indicador de la población estelar (vieja/roja vs joven/azul).
         """
-        # Vectorización con Pandas (rápido y eficiente)
-        self.df['g_r'] = self.df['mu_g'] - self.df['mu_r']
+        # Vectorización directa sobre los arrays de NumPy
+        g_r = self.df['mu_g'].to_numpy() - self.df['mu_r'].to_numpy()
+        self.df['g_r'] = g_r
         
         # Añadimos una media móvil (rolling mean) para suavizar el ruido observacional
         # Esto es muy común en análisis de series temporales o datos espaciales
-        self.df['g_r_smooth'] = self.df['g_r'].rolling(window=3, center=True).mean()
+        # Ventana centrada de 3 puntos; en los extremos se repite el valor del borde
+        self.df['g_r_smooth'] = uniform_filter1d(g_r, size=3, mode='nearest')
         
         return self.df
 
@@ -49,8 +53,7 @@ class GalaxyPhotometryAnalyzer:
         if 'g_r' not in self.df.columns:
             self.compute_color_indices()
 
-        plt.figure(figsize=(10, 6), dpi=100)
-        plt.style.use('seaborn-v0_8-whitegrid')
+        fig = plt.figure(figsize=(10, 6), dpi=100)
 
         # 1. Datos crudos (puntos dispersos)
         plt.plot(self.df['SMA'], self.df['g_r'], 'o', 
@@ -84,11 +87,7 @@ class GalaxyPhotometryAnalyzer:
         plt.legend()
         plt.grid(True, linestyle=':', alpha=0.7)
         
-        if save_path:
-            plt.savefig(save_path)
-            print(f"Gráfica guardada en {save_path}")
-        else:
-            plt.show()
+        show_or_save(fig, save_path, 'perfil_color_g_r.png')
 
 # --- Simulación de carga de datos (Data Mocking) ---
 # En un entorno real, esto vendría de un archivo 'galaxy_data.csv'
@@ -0,0 +1,29 @@
+import os
+from typing import Optional
+
+import matplotlib
+
+# Con la variable de entorno HEADLESS activa no se abre ninguna ventana (CI, lotes).
+# Este módulo debe importarse antes que matplotlib.pyplot para fijar el backend.
+HEADLESS = bool(os.environ.get("HEADLESS"))
+if HEADLESS:
+    matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+# Estilo de las gráficas: se aplica una sola vez al importar el módulo
+plt.style.use('seaborn-v0_8-whitegrid')
+
+
+def show_or_save(fig, save_path: Optional[str], default_path: str):
+    """
+    Guarda la figura (si hay ruta) y la muestra en pantalla. En modo HEADLESS
+    la figura se guarda en save_path (o en default_path si no se indicó) y se cierra.
+    """
+    path = save_path or (default_path if HEADLESS else None)
+    if path:
+        fig.savefig(path)
+        print(f"Gráfica guardada en: {path}")
+    if HEADLESS:
+        plt.close(fig)
+    else:
+        plt.show()
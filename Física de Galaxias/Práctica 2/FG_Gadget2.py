@@ -8,6 +8,7 @@ yt.funcs.mylog.setLevel(50)
 import os 
 import cv2
 import glob
+import re
 from pathlib import Path
 
 
@@ -52,8 +53,14 @@ print("\n--- Generación de 30 imágenes completada ---")
 
 video_name = 'video3poszvelz.avi'
 
-# Buscar todos los archivos PNG generados en el directorio actual
-images = glob.glob('*.png')
+def snapshot_key(path):
+    """Clave de orden: número de snapshot; los PNG sin número van al final, por nombre."""
+    m = re.search(r'snapshot_(\d+)', path)
+    return (m is None, int(m.group(1)) if m else 0, path)
+
+# Buscar los PNG de los snapshots y ordenarlos UNA vez por su número de snapshot.
+# Los nombres ya van con ceros (snapshot_000...), pero así el orden no depende de ello.
+images = sorted(glob.glob('snapshot_*.png'), key=snapshot_key)
 print(f"\nSe encontraron {len(images)} archivos PNG.")
 
 if not images:
@@ -76,8 +83,8 @@ else:
         
         print("Creando video...")
 
-        # Escribir todas las imágenes en orden cronológico
-        for image in sorted(images):
+        # Escribir todas las imágenes en orden cronológico (ya están ordenadas)
+        for image in images:
             # Cargar la imagen y escribirla en el video
             video.write(cv2.imread(image))
         
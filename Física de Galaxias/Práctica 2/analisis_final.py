@@ -1,131 +1,107 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from plot_utils import new_fig
+from datos import read_gadget_snapshot
 import os
-import struct
 import glob
+from multiprocessing import Pool
 
 # --- CONFIGURACIÓN ---
 INPUT_DIR = "output_B"   # Carpeta con los datos
 LIMIT_KPC = 15.0         # Límite para el análisis
 
-# --- FUNCIÓN DE LECTURA (La misma de siempre) ---
-def read_gadget_snapshot(filename):
-    if not os.path.exists(filename): return None, None
-    with open(filename, 'rb') as f:
-        dummy = struct.unpack('i', f.read(4))[0] 
-        if dummy != 256: return None, None
-        npart = np.fromfile(f, dtype=np.int32, count=6)
-        massarr = np.fromfile(f, dtype=np.float64, count=6)
-        time = struct.unpack('d', f.read(8))[0]
-        f.seek(256 - 80, 1) 
-        dummy = struct.unpack('i', f.read(4))[0]
-        dummy = struct.unpack('i', f.read(4))[0]
-        n_total = np.sum(npart)
-        pos = np.fromfile(f, dtype=np.float32, count=n_total*3).reshape(-1, 3)
-        
-        # Seleccionar DISCO (Tipo 2)
-        start_disk = npart[0] + npart[1]
-        end_disk = start_disk + npart[2]
-        pos_disk = pos[start_disk:end_disk]
-        
-        return time, pos_disk
-
-# --- PARTE 1: EXTENSIÓN VS TIEMPO ---
-print("Analizando extensión espacial en función del tiempo...")
-
-files = sorted([f for f in os.listdir(INPUT_DIR) if f.startswith('snapshot')])
-times = []
-std_x = []
-std_y = []
-std_z = []
-
-# Variables para guardar el último snapshot válido para la Parte 2
-last_pos = None
-last_time = 0
-
-for filename in files:
+# --- PROCESADO DE UN SNAPSHOT (se ejecuta en paralelo) ---
+def process_one(filename):
+    """Devuelve (tiempo, std_x, std_y, std_z) de un snapshot, o None si no es válido."""
     full_path = os.path.join(INPUT_DIR, filename)
     try:
-        time, pos = read_gadget_snapshot(full_path)
-    except: continue
+        time, x, y, z = read_gadget_snapshot(full_path)
+    except: return None
     
-    if pos is None or len(pos) == 0: continue
-    
-    # Guardamos datos para luego
-    times.append(time)
+    if x is None or len(x) == 0: return None
     
     # Calculamos la "extensión" como la desviación estándar de las posiciones
     # Esto nos dice cuán "dispersa" está la galaxia en cada eje
-    std_x.append(np.std(pos[:, 0]))
-    std_y.append(np.std(pos[:, 1]))
-    std_z.append(np.std(pos[:, 2]))
-    
-    # Guardamos el último para la parte 2
-    last_pos = pos
-    last_time = time
+    return time, np.std(x), np.std(y), np.std(z)
 
-# Gráfica 1: Extensión vs Tiempo
-plt.figure(figsize=(10, 6))
-plt.plot(times, std_x, 'b-', label='Extensión Eje X (Radio)')
-plt.plot(times, std_y, 'g--', label='Extensión Eje Y (Radio)')
-plt.plot(times, std_z, 'r', linewidth=2, label='Extensión Eje Z (Espesor)')
+if __name__ == "__main__":
+    # --- PARTE 1: EXTENSIÓN VS TIEMPO ---
+    print("Analizando extensión espacial en función del tiempo...")
 
-plt.xlabel('Tiempo (Unidades internas)')
-plt.ylabel('Desviación Estándar Espacial (kpc)')
-plt.title('Evolución del Tamaño de la Galaxia')
-plt.legend()
-plt.grid(True, alpha=0.3)
-plt.savefig('extension_vs_tiempo.png')
-print("-> Gráfica guardada: extension_vs_tiempo.png")
+    files = sorted([f for f in os.listdir(INPUT_DIR) if f.startswith('snapshot')])
 
+    # Cada snapshot es independiente: los repartimos entre todos los núcleos.
+    # map conserva el orden de `files`.
+    with Pool(os.cpu_count()) as pool:
+        results = pool.map(process_one, files)
 
-# --- PARTE 2: ESCALA VERTICAL VS RADIO (Último Snapshot) ---
-print(f"\nAnalizando escala vertical para el último instante (t={last_time:.2f})...")
+    valid = [(filename, res) for filename, res in zip(files, results) if res is not None]
+    times = [res[0] for _, res in valid]
+    std_x = [res[1] for _, res in valid]
+    std_y = [res[2] for _, res in valid]
+    std_z = [res[3] for _, res in valid]
 
-if last_pos is not None:
-    # Coordenadas
-    x = last_pos[:, 0]
-    y = last_pos[:, 1]
-    z = last_pos[:, 2]
-    
-    # Radio cilíndrico R = sqrt(x^2 + y^2)
-    R = np.sqrt(x**2 + y**2)
-    
-    # Definimos anillos (bins) radiales de 0 a 15 kpc
-    bins = np.linspace(0, 15, 30) # 30 anillos
-    bin_centers = 0.5 * (bins[1:] + bins[:-1])
+    # Releemos el último snapshot válido para la Parte 2
+    x = y = z = None
+    last_time = 0
+    if valid:
+        last_time, x, y, z = read_gadget_snapshot(os.path.join(INPUT_DIR, valid[-1][0]))
+
+    # Gráfica 1: Extensión vs Tiempo
+    fig, ax = new_fig()
+    plt.plot(times, std_x, 'b-', label='Extensión Eje X (Radio)')
+    plt.plot(times, std_y, 'g--', label='Extensión Eje Y (Radio)')
+    plt.plot(times, std_z, 'r', linewidth=2, label='Extensión Eje Z (Espesor)')
+
+    plt.xlabel('Tiempo (Unidades internas)')
+    plt.ylabel('Desviación Estándar Espacial (kpc)')
+    plt.title('Evolución del Tamaño de la Galaxia')
+    plt.legend()
+    plt.savefig('extension_vs_tiempo.png')
+    print("-> Gráfica guardada: extension_vs_tiempo.png")
+
+
+    # --- PARTE 2: ESCALA VERTICAL VS RADIO (Último Snapshot) ---
+    print(f"\nAnalizando escala vertical para el último instante (t={last_time:.2f})...")
+
+    if x is not None:
+        # Radio cilíndrico R = sqrt(x^2 + y^2), en un único kernel
+        R = np.hypot(x, y)
     
-    z_scale_height = []
+        # Definimos anillos (bins) radiales de 0 a 15 kpc
+        bins = np.linspace(0, 15, 30) # 30 anillos
+        bin_centers = 0.5 * (bins[1:] + bins[:-1])
     
-    for i in range(len(bins)-1):
-        R_min = bins[i]
-        R_max = bins[i+1]
-        
-        # Seleccionamos partículas en este anillo
-        mask = (R >= R_min) & (R < R_max)
-        z_in_ring = z[mask]
-        
-        if len(z_in_ring) > 10:
-            # La escala vertical se suele estimar como el RMS de Z (root mean square)
-            # o la desviación estándar
-            hz = np.std(z_in_ring)
-            z_scale_height.append(hz)
-        else:
-            z_scale_height.append(np.nan)
+        # La escala vertical se suele estimar como el RMS de Z (root mean square)
+        # o la desviación estándar. Se asigna cada partícula a su anillo con
+        # np.digitize y se acumula por anillo con np.bincount, sin bucles en Python.
+        nbins = len(bins) - 1
+        ring = np.digitize(R, bins) - 1
+        inside = (ring >= 0) & (ring < nbins)
+        ring, z_in = ring[inside], z[inside]
+
+        n_in_ring = np.bincount(ring, minlength=nbins)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z_mean = np.bincount(ring, weights=z_in, minlength=nbins) / n_in_ring
+            # Varianza en dos pasadas (respecto a la media del anillo): evita la
+            # cancelación de E[z^2] - E[z]^2 con posiciones en float32
+            dz = z_in - z_mean[ring]
+            hz = np.sqrt(np.bincount(ring, weights=dz * dz, minlength=nbins) / n_in_ring)
+        # Anillos con 10 partículas o menos no son fiables
+        z_scale_height = np.where(n_in_ring > 10, hz, np.nan)
             
-    # Gráfica 2: Escala Vertical vs Radio
-    plt.figure(figsize=(10, 6))
-    plt.plot(bin_centers, z_scale_height, 'ko-', linewidth=2, label='Espesor del Disco (hz)')
+        # Gráfica 2: Escala Vertical vs Radio
+        fig, ax = new_fig()
+        plt.plot(bin_centers, z_scale_height, 'ko-', linewidth=2, label='Espesor del Disco (hz)')
     
-    plt.xlabel('Radio Galactocéntrico R (kpc)')
-    plt.ylabel('Escala Vertical hz (kpc)')
-    plt.title(f'Estructura Vertical del Disco en t={last_time:.2f}')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.savefig('escala_vertical_vs_radio.png')
-    print("-> Gráfica guardada: escala_vertical_vs_radio.png")
+        plt.xlabel('Radio Galactocéntrico R (kpc)')
+        plt.ylabel('Escala Vertical hz (kpc)')
+        plt.title(f'Estructura Vertical del Disco en t={last_time:.2f}')
+        plt.legend()
+        plt.savefig('escala_vertical_vs_radio.png')
+        print("-> Gráfica guardada: escala_vertical_vs_radio.png")
     
-else:
-    print("Error: No se encontraron datos para el análisis vertical.")
+    else:
+        print("Error: No se encontraron datos para el análisis vertical.")
 
-print("\n¡Análisis completado!")
\ No newline at end of file
+    print("\n¡Análisis completado!")
\ No newline at end of file
@@ -1,7 +1,9 @@
 
 import numpy as np
 import math
+from plot_utils import new_fig, show_or_save  # Fija backend (HEADLESS) antes de pyplot
 import matplotlib.pyplot as plt
+from datos import load_freqdbh
 
 
 
@@ -11,7 +13,7 @@ dist      = 4.5                  # Escala del disco de la Milky Way (kpc)
 
 
 
-data= np.genfromtxt(infile, comments='#')[:,0:]
+data= load_freqdbh(infile)
     
 radius = data[:, 0]
 omegah  = data[:, 1]
@@ -20,18 +22,24 @@ vb    = data[:,5]
     
 vctot=vct*velscale
 vcb=vb*velscale
-vhb=np.sqrt((vcb*vcb)+((omegah*radius*velscale)*(omegah*radius*velscale)))
-disk=np.sqrt((vctot*vctot)-(vhb*vhb))
+# Velocidad del halo calculada una sola vez y reutilizada: vhb^2 = vcb^2 + vhalo^2,
+# así que el disco sale directamente sin pasar por sqrt(...)**2. Los cuadrados
+# se hacen en unidades de código y velscale se saca fuera de la raíz
+vh=omegah*radius
+vhalo=vh*velscale
+vh2=vh*vh
+vb2=vb*vb
+vhb=velscale*np.sqrt(vb2+vh2)
+disk=velscale*np.sqrt(vct*vct-vb2-vh2)
 print(vctot)
 print(vhb)
-vhalo=omegah*radius*velscale
-plt.plot(radius*dist,vctot)
+fig, ax = new_fig()
+# Las cuatro curvas en una sola llamada (una columna por componente),
+# rasterizadas para que el guardado no tesele cada trazo vectorial
+lines=plt.plot(radius*dist,np.column_stack([vctot,vcb,disk,vhalo]),rasterized=True)
 plt.xlabel('Galactocentric radius (kpc)')
 plt.ylabel('Rotation velocity km/s')
 plt.xlim(0, 25)
-plt.plot(radius*dist,vcb)
-plt.plot(radius*dist,disk)
-plt.plot(radius*dist,vhalo)
-plt.legend(['Total rotation velocity','Bulge rotation velocity','Disk rotation velocity','Halo rotation velocity',])
+plt.legend(lines,['Total rotation velocity','Bulge rotation velocity','Disk rotation velocity','Halo rotation velocity',])
 
-plt.show()
+show_or_save(fig, None, 'curva_rotacion.png')
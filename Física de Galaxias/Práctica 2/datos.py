@@ -0,0 +1,79 @@
+import os
+import numpy as np
+import pandas as pd
+
+
+def load_freqdbh(path="freqdbh.dat"):
+    """
+    Lee freqdbh.dat (salida de GalacTICS) usando una copia binaria (.npy) al lado
+    del fichero de texto. La copia se regenera si el .dat es más reciente que ella.
+    """
+    npy = path + ".npy"
+    if os.path.exists(npy) and os.path.getmtime(npy) >= os.path.getmtime(path):
+        return np.load(npy)
+    # Parser en C de pandas; se mantiene float64 porque las masas M = R V^2 / G
+    # rondan 1e10-1e11 y el .npy debe conservar los datos originales
+    data = pd.read_csv(path, sep=r'\s+', comment='#', header=None).to_numpy(dtype=np.float64)
+    try:
+        np.save(npy, data)
+    except OSError:
+        # Directorio de solo lectura (datos compartidos): se trabaja sin caché
+        pass
+    return data
+
+
+# --- LECTURA DE SNAPSHOTS DE GADGET-2 (BINARIO) ---
+# Cabecera de Gadget-2 (Format 1): marcador de bloque + 256 bytes de HEAD + marcador
+# de cierre, seguida del marcador de apertura del bloque POS. Se lee de una sola vez.
+HEADER_DTYPE = np.dtype([
+    ('blk_head', np.int32),
+    ('npart', np.int32, 6),         # cuántas partículas de cada tipo hay
+    ('massarr', np.float64, 6),
+    ('time', np.float64),
+    ('redshift', np.float64),
+    ('resto', np.uint8, 256 - 6*4 - 6*8 - 2*8),  # flags, BoxSize, cosmología (no se usan)
+    ('blk_head_end', np.int32),
+    ('blk_pos', np.int32),
+])
+
+def read_gadget_snapshot(filename):
+    """
+    Lee un archivo binario estándar de Gadget-2 (Format 1).
+    Devuelve el tiempo y las coordenadas x, y, z de las partículas del DISCO,
+    cada una como un array contiguo.
+    """
+    if not os.path.exists(filename):
+        return None, None, None, None
+
+    with open(filename, 'rb') as f:
+        # 1. LEER CABECERA (una única lectura interpretada con un dtype estructurado)
+        raw = f.read(HEADER_DTYPE.itemsize)
+    if len(raw) < HEADER_DTYPE.itemsize:
+        return None, None, None, None
+    header = np.frombuffer(raw, dtype=HEADER_DTYPE)[0]
+    if header['blk_head'] != 256:
+        return None, None, None, None
+
+    npart = header['npart']
+    time = float(header['time'])
+
+    # 2. LEER POSICIONES
+    # El total de partículas es la suma de npart
+    n_total = int(np.sum(npart))
+    
+    # Mapeamos en memoria el bloque POS completo (3 floats por partícula: x, y, z):
+    # el sistema operativo solo lee del disco las páginas que realmente tocamos
+    pos = np.memmap(filename, dtype=np.float32, mode='r',
+                    offset=HEADER_DTYPE.itemsize, shape=(n_total, 3))
+    
+    # --- SELECCIONAR SOLO DISCO (Tipo 2 en Gadget) ---
+    # Inicio del disco = npart[0] (Gas) + npart[1] (Halo)
+    start_disk = npart[0] + npart[1]
+    end_disk = start_disk + npart[2]
+    
+    # Copiamos solo el disco a memoria normal, una coordenada por array contiguo
+    # (así se libera el mapeo del fichero y los cálculos leen memoria seguida)
+    pos_disk = pos[start_disk:end_disk]
+    x, y, z = (np.ascontiguousarray(pos_disk[:, i]) for i in range(3))
+    
+    return time, x, y, z
@@ -2,6 +2,8 @@ import numpy as np
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from plot_utils import new_fig
+from datos import load_freqdbh
 
 # --- CONFIGURACIÓN DE UNIDADES ---
 # Factor para convertir la velocidad interna a km/s.
@@ -9,9 +11,9 @@ import matplotlib.pyplot as plt
 UNIT_VELOCITY = 300.0 
 G_CONST = 4.301e-6  # Constante G en (kpc * km^2/s^2 / M_sol)
 
-# 1. Cargar datos
+# 1. Cargar datos (el texto solo se parsea la primera vez)
 try:
-    data = np.loadtxt('freqdbh.dat')
+    data = load_freqdbh('freqdbh.dat')
 except:
     print("Error: No encuentro freqdbh.dat")
     exit()
@@ -22,54 +24,66 @@ Omega_halo = data[:, 1]
 V_total_code = data[:, 4]   # Velocidad en unidades de código
 V_bulbo_code = data[:, 5]   # Velocidad en unidades de código
 
-# 3. CONVERSIÓN A UNIDADES FÍSICAS
-V_total = V_total_code * UNIT_VELOCITY
-V_bulbo = V_bulbo_code * UNIT_VELOCITY
+# 3. VELOCIDADES EN UNIDADES DE CÓDIGO
+# Todo se calcula en unidades internas: el factor UNIT_VELOCITY solo entra al
+# final, como el escalar UNIT_VELOCITY^2 / G en la masa
 
-# Recalculamos Halo y Disco usando las velocidades físicas
+# Recalculamos Halo y Disco
 # V_halo = R * Omega. Ojo: Omega también necesita escalado si R está en kpc.
 # Método más seguro: Calcular V_halo restando componentes si tenemos dudas de Omega,
 # PERO el archivo da Omega. Asumamos que V_halo_code = R * Omega_code
 V_halo_code = R_kpc * Omega_halo
-V_halo = V_halo_code * UNIT_VELOCITY
 
 # V_disco por descarte: V_tot^2 = V_b^2 + V_d^2 + V_h^2
-V_disco_sq = V_total**2 - V_bulbo**2 - V_halo**2
-V_disco = np.sqrt(np.maximum(V_disco_sq, 0))
+# (un único array reutilizado in situ; el clip evita raíces de valores negativos)
+V_disco_code = V_total_code * V_total_code
+V_disco_code -= V_bulbo_code * V_bulbo_code
+V_disco_code -= V_halo_code * V_halo_code
+np.clip(V_disco_code, 0, None, out=V_disco_code)
+np.sqrt(V_disco_code, out=V_disco_code)
 
 # 4. CALCULO DE MASA ACUMULATIVA M(<R)
-# Formula: M = (R * V^2) / G
-# Evitamos división por cero usando np.where o máscara
-M_total = np.zeros_like(R_kpc)
-M_bulbo = np.zeros_like(R_kpc)
-M_halo = np.zeros_like(R_kpc)
-M_disco = np.zeros_like(R_kpc)
-
-# Calculamos solo donde R > 0 para evitar errores
-mask = R_kpc > 0
-M_total[mask] = (R_kpc[mask] * V_total[mask]**2) / G_CONST
-M_bulbo[mask] = (R_kpc[mask] * V_bulbo[mask]**2) / G_CONST
-M_halo[mask]  = (R_kpc[mask] * V_halo[mask]**2)  / G_CONST
-M_disco[mask] = (R_kpc[mask] * V_disco[mask]**2) / G_CONST
+# Formula: M = (R * V^2) / G, con V = V_code * UNIT_VELOCITY
+# Las cuatro componentes se apilan (4 x N) y las masas salen de un único einsum.
+# No se divide por R, así que no hace falta máscara: solo se fija a cero la
+# columna de R = 0 por si Omega viene como NaN en el origen
+Vs = np.stack([V_total_code, V_bulbo_code, V_halo_code, V_disco_code])
+M = np.einsum('i,ji,ji->ji', R_kpc, Vs, Vs)
+M *= UNIT_VELOCITY * UNIT_VELOCITY / G_CONST
+M[:, R_kpc <= 0] = 0.0
+M_total, M_bulbo, M_halo, M_disco = M
 
 # 5. GRAFICAR
-plt.figure(figsize=(10, 6))
+fig, ax = new_fig()
 
 # Escala Y en 10^10 Masas solares
 scale = 1e10
 
-plt.plot(R_kpc, M_total/scale, 'k-', linewidth=2, label='Masa Total Dinámica')
-plt.plot(R_kpc, M_disco/scale, 'g--', linewidth=2, label='Masa Disco')
-plt.plot(R_kpc, M_halo/scale,  'r:', linewidth=2, label='Masa Halo')
-plt.plot(R_kpc, M_bulbo/scale, 'b-.', linewidth=2, label='Masa Bulbo')
+# Una sola llamada para las cuatro curvas (orden: total, disco, halo, bulbo);
+# el estilo y la etiqueta de cada línea se fijan después
+M_plot = M[[0, 3, 2, 1]] / scale
+# Solo se dibuja la ventana visible (R <= 15 kpc) más un punto, para que la
+# línea llegue hasta el borde del eje. searchsorted exige R creciente: si no lo
+# es, se dibuja el rango completo
+if np.all(np.diff(R_kpc) >= 0):
+    n_vis = np.searchsorted(R_kpc, 15, side='right') + 1
+else:
+    n_vis = R_kpc.size
+lines = plt.plot(R_kpc[:n_vis], M_plot[:, :n_vis].T, linewidth=2, rasterized=True)
+styles = [('k', '-', 'Masa Total Dinámica'), ('g', '--', 'Masa Disco'),
+          ('r', ':', 'Masa Halo'), ('b', '-.', 'Masa Bulbo')]
+for ln, (color, ls, label) in zip(lines, styles):
+    ln.set(color=color, linestyle=ls, label=label)
 
 plt.xlabel('Radio (kpc)')
 plt.ylabel(r'Masa Acumulada ($10^{10} M_{\odot}$)')
 plt.title('Distribución de Masa Acumulativa (Unidades Corregidas)')
 plt.legend()
-plt.grid(True, alpha=0.3)
 plt.xlim(0, 15)
-plt.ylim(0, None) # Dejar que matplotlib ajuste el límite superior
+# Límite superior como el autoescalado sobre el rango completo de R (no solo la
+# ventana dibujada), con el mismo margen que aplica matplotlib
+y_min, y_max = np.nanmin(M_plot), np.nanmax(M_plot)
+plt.ylim(0, y_max + plt.rcParams['axes.ymargin'] * (y_max - y_min))
 
 plt.savefig('masa_acumulativa_corregida.png')
 print("Gráfica guardada: masa_acumulativa_corregida.png")
\ No newline at end of file
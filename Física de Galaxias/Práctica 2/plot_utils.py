@@ -0,0 +1,41 @@
+import os
+from typing import Optional
+
+import matplotlib
+
+# Con la variable de entorno HEADLESS activa no se abre ninguna ventana (CI, lotes).
+# Mismo comportamiento que Práctica 1/plot_utils.py; importar antes que pyplot.
+HEADLESS = bool(os.environ.get("HEADLESS"))
+if HEADLESS:
+    matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+# Configuración común de las gráficas de la práctica, aplicada una sola vez al importar.
+# Simplificación agresiva de trazos: las curvas densas se dibujan con menos vértices.
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 1.0
+
+
+def new_fig(figsize=(10, 6)):
+    """
+    Crea la figura estándar de los scripts (10x6 con rejilla suave) y la deja
+    como figura actual, de modo que las llamadas plt.* siguientes actúan sobre ella.
+    """
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.grid(True, alpha=0.3)
+    return fig, ax
+
+
+def show_or_save(fig, save_path: Optional[str], default_path: str):
+    """
+    Guarda la figura (si hay ruta) y la muestra en pantalla. En modo HEADLESS
+    la figura se guarda en save_path (o en default_path si no se indicó) y se cierra.
+    """
+    path = save_path or (default_path if HEADLESS else None)
+    if path:
+        fig.savefig(path)
+        print(f"Gráfica guardada en: {path}")
+    if HEADLESS:
+        plt.close(fig)
+    else:
+        plt.show()
@@ -2,6 +2,7 @@ import numpy as np
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from plot_utils import new_fig
 
 # 1. Cargar datos
 try:
@@ -14,9 +15,16 @@ R = data[:, 0]
 Q = data[:, 1]
 
 # 2. Graficar
-plt.figure(figsize=(10, 6))
+fig, ax = new_fig()
 
-plt.plot(R, Q, 'k-', linewidth=2, label='Parámetro Q de Toomre')
+# Solo la ventana visible en R (hasta 6.5 kpc) más un punto para llegar al borde.
+# Q no se recorta: quitar puntos con Q > 5 rompería la línea en tramos falsos.
+# searchsorted exige R creciente: si no lo es, se dibuja el rango completo
+if np.all(np.diff(R) >= 0):
+    n_vis = np.searchsorted(R, 6.5, side='right') + 1
+else:
+    n_vis = R.size
+plt.plot(R[:n_vis], Q[:n_vis], 'k-', linewidth=2, label='Parámetro Q de Toomre')
 
 # Dibujamos la linea critica de estabilidad Q=1
 plt.axhline(y=1.0, color='r', linestyle='--', linewidth=2, label='Límite de Estabilidad (Q=1)')
@@ -26,7 +34,6 @@ plt.xlabel('Radio (kpc)')
 plt.ylabel('Parámetro de Toomre Q')
 plt.title('Estabilidad del Disco (Galaxia B)')
 plt.legend()
-plt.grid(True, alpha=0.3)
 
 # Ajustamos los ejes para ver bien la zona crítica
 plt.xlim(0, 6.5) # Los datos parecen llegar hasta 6 kpc